@@ -4,6 +4,7 @@ import argparse
 import os
 import sys
 from argparse import Namespace
+from dataclasses import replace
 from textwrap import dedent
 from typing import override
 
@@ -88,7 +89,8 @@ def _create_argument_parser(defaults: DefaultsConfig) -> argparse.ArgumentParser
     "-d",
     "--dry",
     action="store_true",
-    help="preview installation steps without executing commands or writing files",
+    help="preview installation steps without executing commands or writing files "
+    "(set KICKSTART_DRY_DELAY=SECONDS to pause after each line)",
     dest="dry",
   )
 
@@ -105,7 +107,7 @@ def _create_argument_parser(defaults: DefaultsConfig) -> argparse.ArgumentParser
     "--libc",
     metavar="LIBC",
     type=str,
-    default=defaults["libc"],
+    default=defaults.libc,
     help="C library implementation (glibc or musl) [default: %(default)s]",
     dest="libc",
   )
@@ -115,7 +117,7 @@ def _create_argument_parser(defaults: DefaultsConfig) -> argparse.ArgumentParser
     "--timezone",
     metavar="TIMEZONE",
     type=str,
-    default=defaults["timezone"],
+    default=defaults.timezone,
     help="system timezone in Region/City format [default: %(default)s]",
     dest="timezone",
   )
@@ -125,7 +127,7 @@ def _create_argument_parser(defaults: DefaultsConfig) -> argparse.ArgumentParser
     "--keymap",
     metavar="KEYMAP",
     type=str,
-    default=defaults["keymap"],
+    default=defaults.keymap,
     help="keyboard layout for the system [default: %(default)s]",
     dest="keymap",
   )
@@ -134,11 +136,19 @@ def _create_argument_parser(defaults: DefaultsConfig) -> argparse.ArgumentParser
     "--locale",
     metavar="LOCALE",
     type=str,
-    default=defaults["locale"],
+    default=defaults.locale,
     help="system locale (e.g., en_US, en_US.UTF-8, C, POSIX) [default: %(default)s]",
     dest="locale",
   )
 
+  _ = parser.add_argument(
+    "-y",
+    "--yes",
+    action="store_true",
+    help="skip the disk erase confirmation",
+    dest="assume_yes",
+  )
+
   _ = parser.add_argument(
     "--hostname",
     metavar="HOSTNAME",
@@ -162,6 +172,7 @@ def _create_context_config(args: Namespace) -> ContextConfig:
     locale=str(getattr(args, "locale", "C")),
     hostname=getattr(args, "hostname", None),
     profile=getattr(args, "profile", None),
+    assume_yes=bool(getattr(args, "assume_yes", False)),
   )
 
 
@@ -266,12 +277,11 @@ def main() -> None:
     config_fields = ["libc", "timezone", "keymap", "locale"]
 
     # fmt: off
-    for field in (
-      f for f in config_fields
+    ctx.config = replace(ctx.config, **{
+      f: getattr(ctx.profile.config, f) for f in config_fields
       if getattr(ctx.profile.config, f)
-      and getattr(ctx.config, f) == defaults[f]
-    ):
-      setattr(ctx.config, field, getattr(ctx.profile.config, field))
+      and getattr(ctx.config, f) == getattr(defaults, f)
+    })
     # fmt: on
 
   ctx.ui = TUI(dry_mode=config.dry, distro_id=distro_id)
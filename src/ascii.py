@@ -50,10 +50,18 @@ def _build_kickstart_logo(logo: str, tagline_style: str, tagline_text: str) -> s
   return f"{logo}\n{_kickstart_text}\n[{tagline_style}]{tagline_text}[/]"
 
 
+LOGOS: dict[str, tuple[str, str, str]] = {
+  "arch": (_arch_logo, "blue", "Arch Linux installer, simplified."),
+  "void": (_void_logo, "green", "Void Linux installer, simplified."),
+}
+
+
+def format_logo(distro_id: str) -> str:
+  """Return the logo markup for a distro, falling back to Tux."""
+  logo, tagline_style, tagline_text = LOGOS.get(distro_id, (_linux_logo, "yellow", "Linux installer, simplified."))
+  return _build_kickstart_logo(logo, tagline_style, tagline_text)
+
+
 def print_logo(distro_id: str) -> None:
   console.clear()
-  logos = {
-    "arch": _build_kickstart_logo(_arch_logo, "blue", "Arch Linux installer, simplified."),
-    "void": _build_kickstart_logo(_void_logo, "green", "Void Linux installer, simplified."),
-  }
-  console.print(logos.get(distro_id, _build_kickstart_logo(_linux_logo, "yellow", "Linux installer, simplified.")))
+  console.print(format_logo(distro_id))
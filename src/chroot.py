@@ -1,48 +1,48 @@
-import json
 import os
-import subprocess
 from textwrap import dedent
+from typing import cast
 
 from rich.console import Console
 
 from src.context import InstallerContext
-from src.distros import get_distro
+from src.distros import DistroProtocol
 from src.tui import TUI
-from src.utils import get_gpu_packages, get_resource_path
+from src.utils import get_gpu_packages, load_config
 
 console = Console()
 
 
-def _section_header() -> str:
-  return dedent("""\
-    #!/usr/bin/env -S bash -e
-  """)
+# Static script fragments, dedented once at import
+CHROOT_HEADER = dedent("""\
+  #!/usr/bin/env -S bash -e
+""")
 
+FIREWALL_DEFAULTS = dedent("""\
+  ufw default deny incoming
+  ufw default allow outgoing
+""")
 
-def _section_initramfs_setup(crypt_uuid: str, luks_pass: str, distro_id: str, dry_mode: bool) -> str:
-  distro = get_distro(distro_id, dry_mode)
+
+def _section_initramfs_setup(crypt_uuid: str, luks_pass: str, distro: DistroProtocol) -> str:
   return distro.initramfs_config(crypt_uuid, luks_pass)
 
 
-def _section_setup_commands(props: dict[str, str], distro_id: str, dry_mode: bool) -> str:
-  distro = get_distro(distro_id, dry_mode)
+def _section_setup_commands(props: dict[str, str], distro: DistroProtocol) -> str:
   commands = distro.setup_commands(props)
   return "\n".join(commands) if commands else ""
 
 
-def _section_bootloader_install(crypt_uuid: str, distro_name: str, distro_id: str, dry_mode: bool) -> str:
-  distro = get_distro(distro_id, dry_mode)
+def _section_bootloader_install(crypt_uuid: str, distro_name: str, distro: DistroProtocol) -> str:
   return distro.bootloader_config(crypt_uuid, distro_name)
 
 
 def _get_package_list(ctx: InstallerContext, warnings: list[str]) -> list[str]:
   """Get final package list based on profile configuration and GPU detection."""
-  config_file = get_resource_path("config.json")
-  with open(config_file) as f:
-    config_data = json.load(f)
-    if "packages" not in config_data or ctx.distro_id not in config_data["packages"]:
-      return []
-    default_pkgs: list[str] = config_data["packages"][ctx.distro_id]
+  config_data = load_config()
+  if "packages" not in config_data or ctx.distro_id not in config_data["packages"]:
+    return []
+
+  default_pkgs = cast(list[str], config_data["packages"][ctx.distro_id])
 
   gpu_packages = get_gpu_packages(ctx.distro_id, warnings if ctx.dry else None)
   profile_pkgs = ctx.profile.packages if ctx.profile else None
@@ -63,24 +63,18 @@ def _section_install_packages(ctx: InstallerContext, warnings: list[str]) -> str
   if not pkgs_list:
     return ""
 
-  distro = get_distro(ctx.distro_id, ctx.dry)
-  return distro.install_packages(pkgs_list)
+  return ctx.distro.install_packages(pkgs_list)
 
 
 def _section_post_install(ctx: InstallerContext) -> str:
   commands = []
-  distro = get_distro(ctx.distro_id, ctx.dry)
+  distro = ctx.distro
 
   services = distro.default_services()
   if services:
     commands.append(f"{distro.enable_services(services)}\n")
 
-  commands.append(
-    dedent("""\
-      ufw default deny incoming
-      ufw default allow outgoing
-    """)
-  )
+  commands.append(FIREWALL_DEFAULTS)
 
   commands.append(
     dedent(f"""\
@@ -105,30 +99,25 @@ def generate_chroot(
   warnings: list[str],
   ui: TUI,
 ) -> None:
-  crypt_uuid = (
-    "MOCK-CRYPT-UUID"
-    if dry_run
-    else subprocess.run(
-      "blkid --match-tag UUID --output value /dev/disk/by-partlabel/ENCRYPTED",
-      check=True,
-      shell=True,
-      capture_output=True,
-      text=True,
-    ).stdout.strip()
-  )
+  assert ctx.crypt_uuid is not None
+  crypt_uuid = ctx.crypt_uuid
   props = {"timezone": ctx.config.timezone, "keymap": ctx.config.keymap}
   parts: list[str] = [
-    _section_header(),
+    CHROOT_HEADER,
     _section_install_packages(ctx, warnings),
-    _section_setup_commands(props, ctx.distro_id, ctx.dry),
-    _section_initramfs_setup(crypt_uuid, luks_pass, ctx.distro_id, ctx.dry),
-    _section_bootloader_install(crypt_uuid, distro_name, ctx.distro_id, ctx.dry),
+    _section_setup_commands(props, ctx.distro),
+    _section_initramfs_setup(crypt_uuid, luks_pass, ctx.distro),
+    _section_bootloader_install(crypt_uuid, distro_name, ctx.distro),
     _section_post_install(ctx),
   ]
   if dry_run:
     ui.print("[dim][DRY RUN] Generated chroot script:[/]")
     ui.print(f"[dim]{'\n'.join(parts)}[/]")
   else:
-    with open(path, "w") as f:
-      _ = f.write("\n".join(parts))
-    _ = os.chmod(path, 0o755)
+    # Create the script executable up front and write it in a single call
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    try:
+      _ = os.write(fd, "\n".join(parts).encode())
+
+    finally:
+      os.close(fd)
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from src.distros import DistroProtocol, get_distro
 from src.profiles import InstallationProfile
 from src.tui import TUI
+from src.utils import DefaultsConfig, load_defaults
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContextConfig:
   dry: bool
   libc: str
@@ -15,6 +17,7 @@ class ContextConfig:
   locale: str
   hostname: str | None = None
   profile: str | None = None
+  assume_yes: bool = False
 
 
 class InstallerContext:
@@ -45,6 +48,7 @@ class InstallerContext:
     self.cryptroot: str | None = None
     self.esp: str | None = None
     self.root: str | None = None
+    self.crypt_uuid: str | None = None
 
     # UI components
     self.ui: TUI | None = None
@@ -53,3 +57,13 @@ class InstallerContext:
   def dry(self) -> bool:
     """Access dry run flag from config."""
     return self.config.dry
+
+  @property
+  def distro(self) -> DistroProtocol:
+    """Access the distro module, loaded once per distro_id."""
+    return get_distro(self.distro_id, self.dry)
+
+  @property
+  def defaults(self) -> DefaultsConfig:
+    """Access the distro defaults, parsed once per distro_id."""
+    return load_defaults(self.distro_id)
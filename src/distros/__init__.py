@@ -1,6 +1,7 @@
 """Distro adapter registry"""
 
 import sys
+from functools import lru_cache
 from importlib import import_module
 from typing import cast
 
@@ -13,6 +14,7 @@ console = Console()
 __all__ = ["get_distro", "get_supported_distros", "DistroProtocol"]
 
 
+@lru_cache(maxsize=4)
 def get_distro(distro_id: str, dry_mode: bool = False) -> DistroProtocol:
   """
   Load and return the distro module for the given distro_id.
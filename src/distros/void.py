@@ -5,8 +5,8 @@ from textwrap import dedent
 
 def prepare_base_system() -> list[str]:
   return [
-    "mkdir -p /mnt/var/db/xbps/keys",
-    "cp /var/db/xbps/keys/* /mnt/var/db/xbps/keys",
+    "mkdir -p /mnt/var/db/xbps",
+    "cp -r /var/db/xbps/keys /mnt/var/db/xbps",
   ]
 
 
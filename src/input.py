@@ -1,3 +1,5 @@
+import hmac
+
 from rich.console import Console
 from rich.prompt import Prompt, PromptBase
 from src.validations import (
@@ -8,6 +10,9 @@ from src.validations import (
 
 console = Console()
 
+# Linux N_TTY buffer is 4096 bytes including the newline
+MAX_TERMINAL_INPUT = 4095
+
 
 class HostnamePrompt:
   @classmethod
@@ -46,8 +51,15 @@ class PasswordPrompt:
         console.print("\n[prompt.invalid]Invalid password - try again.[/]")
         continue
 
+      # A canonical-mode terminal silently cuts lines at its input buffer size
+      if len(user_pass.encode()) >= MAX_TERMINAL_INPUT:
+        console.print(
+          f"\n[prompt.invalid]Password too long for terminal input - use less than {MAX_TERMINAL_INPUT} bytes.[/]"
+        )
+        continue
+
       user_pass_check = Prompt.ask("Verify the password", password=True)
-      if user_pass != user_pass_check:
+      if not hmac.compare_digest(user_pass.encode(), user_pass_check.encode()):
         console.print("\n[prompt.invalid]Passwords don't match, please try again.[/]")
         continue
 
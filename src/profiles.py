@@ -11,7 +11,7 @@ from __future__ import annotations
 import json
 import urllib.error
 import urllib.request
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import cast
 
@@ -22,6 +22,9 @@ from src.validations import validate_profile_json
 
 console = Console()
 
+URL_PREFIXES = ("http://", "https://")
+PATH_PREFIXES = ("/", "./")
+
 
 @dataclass
 class ProfileConfig:
@@ -55,45 +58,28 @@ class InstallationProfile:
 
   @classmethod
   def from_dict(cls, data: dict[str, object]) -> InstallationProfile:
-    """Create profile from dictionary."""
-    name = str(data["name"])
-    description = str(data["description"])
-    distro = str(data["distro"])
-
-    config_data = data.get("config", {})
-    config = (
-      ProfileConfig(
-        libc=str(config_data.get("libc")) if isinstance(config_data.get("libc"), str) else None,
-        timezone=str(config_data.get("timezone")) if isinstance(config_data.get("timezone"), str) else None,
-        keymap=str(config_data.get("keymap")) if isinstance(config_data.get("keymap"), str) else None,
-        locale=str(config_data.get("locale")) if isinstance(config_data.get("locale"), str) else None,
-      )
-      if isinstance(config_data, dict)
-      else ProfileConfig()
-    )
-
-    packages_data = data.get("packages", {})
-    packages = (
-      PackageSelection(
-        additional=cast(list[str], packages_data.get("additional", [])),
-        exclude=cast(list[str], packages_data.get("exclude", [])),
-      )
-      if isinstance(packages_data, dict)
-      else PackageSelection()
-    )
-
-    hostname = str(data["hostname"]) if isinstance(data.get("hostname"), str) else None
-    post_install_commands = cast(list[str], data.get("post_install_commands", []))
+    """Create profile from dictionary already checked by validate_profile_json."""
+    config_data = cast(dict[str, object], data.get("config") or {})
+    packages_data = cast(dict[str, list[str]], data.get("packages") or {})
+    hostname = data.get("hostname")
 
+    # fmt: off
     return cls(
-      name=name,
-      description=description,
-      distro=distro,
-      config=config,
-      packages=packages,
-      hostname=hostname,
-      post_install_commands=post_install_commands,
+      name=str(data["name"]),
+      description=str(data["description"]),
+      distro=str(data["distro"]),
+      config=ProfileConfig(**{
+        f.name: value for f in fields(ProfileConfig)
+        if isinstance(value := config_data.get(f.name), str)
+      }),
+      packages=PackageSelection(
+        additional=packages_data.get("additional") or [],
+        exclude=packages_data.get("exclude") or [],
+      ),
+      hostname=hostname if isinstance(hostname, str) else None,
+      post_install_commands=cast(list[str], data.get("post_install_commands") or []),
     )
+    # fmt: on
 
 
 class ProfileLoader:
@@ -122,7 +108,7 @@ class ProfileLoader:
         if content_type and "application/json" not in content_type and "text/json" not in content_type:
           console.print(f"[yellow]Warning: Server returned Content-Type '{content_type}', expected JSON[/]")
 
-        parsed_data = json.loads(response.read().decode("utf-8"))
+        parsed_data = json.loads(response.read())
         if not isinstance(parsed_data, dict):
           raise ValueError("Profile JSON must be an object")
 
@@ -170,8 +156,10 @@ class ProfileLoader:
     Raises:
         ValueError: If profile cannot be loaded or is invalid
     """
+    is_url = source.startswith(URL_PREFIXES)
+
     try:
-      if distro_id and not source.startswith(("http://", "https://", "/", "./")):
+      if distro_id and not is_url and not source.startswith(PATH_PREFIXES):
         data = get_embedded_profile(distro_id, source)
         if data:
           validation_issues = validate_profile_json(data)
@@ -184,7 +172,7 @@ class ProfileLoader:
           profile = InstallationProfile.from_dict(data)
           return profile
 
-      if source.startswith(("http://", "https://")):
+      if is_url:
         data = cls._load_from_url(source)
       else:
         data = cls._load_from_file(source)
@@ -9,6 +9,33 @@ The distro field is injected from the tuple key when retrieved.
 
 from typing import Final
 
+# Packages shared by the niri profiles, kept once so each name is stored a single time
+_NIRI_PACKAGES: Final[tuple[str, ...]] = (
+  "alacritty",
+  "dunst",
+  "firefox",
+  "fuzzel",
+  "libnotify",
+  "mesa",
+  "mpv",
+  "niri",
+  "noto-fonts-cjk",
+  "noto-fonts-emoji",
+  "optipng",
+  "pipewire",
+  "polkit",
+  "sassc",
+  "starship",
+  "tumbler",
+  "wireplumber",
+  "xdg-desktop-portal-gtk",
+  "xdg-user-dirs",
+  "xdg-utils",
+  "xfce4-settings",
+  "xfconf",
+  "zoxide",
+)
+
 PROFILES: Final[dict[tuple[str, str], dict[str, object]]] = {
   ("linux", "test"): {
     "name": "Minimal System for testing",
@@ -33,33 +60,11 @@ PROFILES: Final[dict[tuple[str, str], dict[str, object]]] = {
     },
     "packages": {
       "additional": [
+        *_NIRI_PACKAGES,
         "Thunar",
-        "alacritty",
-        "dunst",
-        "firefox",
-        "fuzzel",
-        "libnotify",
-        "mesa",
-        "mpv",
         "nerd-fonts",
-        "niri",
-        "noto-fonts-cjk",
-        "noto-fonts-emoji",
         "noto-fonts-ttf",
-        "optipng",
-        "pipewire",
-        "polkit",
-        "sassc",
-        "starship",
-        "tumbler",
         "vulkan-loader",
-        "wireplumber",
-        "xdg-desktop-portal-gtk",
-        "xdg-user-dirs",
-        "xdg-utils",
-        "xfce4-settings",
-        "xfconf",
-        "zoxide",
       ],
       "exclude": [],
     },
@@ -79,35 +84,13 @@ PROFILES: Final[dict[tuple[str, str], dict[str, object]]] = {
     },
     "packages": {
       "additional": [
-        "alacritty",
-        "dunst",
-        "firefox",
-        "fuzzel",
+        *_NIRI_PACKAGES,
         "less",
-        "libnotify",
-        "mesa",
-        "mpv",
-        "niri",
         "noto-fonts",
-        "noto-fonts-cjk",
-        "noto-fonts-emoji",
         "openssh",
         "openssl",
-        "optipng",
-        "pipewire",
-        "polkit",
-        "sassc",
-        "starship",
         "thunar",
         "ttf-jetbrains-mono-nerd",
-        "tumbler",
-        "wireplumber",
-        "xdg-desktop-portal-gtk",
-        "xdg-user-dirs",
-        "xdg-utils",
-        "xfce4-settings",
-        "xfconf",
-        "zoxide",
       ],
       "exclude": [],
     },
@@ -2,34 +2,36 @@ import subprocess
 import sys
 from typing import Callable
 
-from rich.console import Console
 from rich.prompt import Confirm
 
 from src.chroot import generate_chroot
 from src.context import InstallerContext
-from src.distros import get_distro
 from src.utils import (
   cmd,
-  load_defaults,
+  cmd_batch,
+  console,
+  copy_file,
   scmd,
   set_disk,
   set_host,
   set_user,
-  write,
+  write_files,
 )
 
-console = Console()
+Step = Callable[[InstallerContext, list[str]], None]
+
+BTRFS_FSTAB_ENTRY = "UUID={uuid} {mount} btrfs compress=zstd,noatime,subvol={subvol} 0 0"
+
+SETTINGS_LABELS = (
+  ("C library", "libc"),
+  ("Keymap", "keymap"),
+  ("Locale", "locale"),
+  ("Timezone", "timezone"),
+)
 
 
 def step_0_settings(ctx: InstallerContext, _warnings: list[str]) -> None:
   assert ctx.ui is not None
-  config_items = [
-    ("C library", ctx.config.libc),
-    ("Keymap", ctx.config.keymap),
-    ("Locale", ctx.config.locale),
-    ("Timezone", ctx.config.timezone),
-  ]
-
   ctx.ui.initialize()
 
   # Print config information
@@ -37,9 +39,8 @@ def step_0_settings(ctx: InstallerContext, _warnings: list[str]) -> None:
     console.print("Skipping root and system checks in dry run mode")
     console.print()
 
-  for label, value in config_items:
-    console.print(f" • {label}: {value}")
-  console.print()
+  summary = "\n".join(f" • {label}: {getattr(ctx.config, field)}" for label, field in SETTINGS_LABELS)
+  console.print(f"{summary}\n")
 
   # Select hostname: CLI > profile > interactive
   # fmt: off
@@ -54,7 +55,7 @@ def step_0_settings(ctx: InstallerContext, _warnings: list[str]) -> None:
   ctx.user_name, ctx.user_pass = set_user()
 
   console.print(f"\n[bold yellow]WARNING:[/] All data on {ctx.disk} will be erased.", style="bold")
-  response = Confirm.ask("Are you sure you want to continue?", default=False)
+  response = ctx.config.assume_yes or Confirm.ask("Are you sure you want to continue?", default=False)
   if not response:
     console.print("\n[prompt.invalid]Installation aborted. No changes were made to the system.[/]")
     sys.exit(0)
@@ -68,33 +69,41 @@ def step_0_settings(ctx: InstallerContext, _warnings: list[str]) -> None:
 
 def step_1_disk_setup(ctx: InstallerContext, _warnings: list[str]) -> None:
   assert ctx.ui is not None
-  cmd(f"wipefs -af {ctx.disk}", ctx.dry, ctx.ui)
-  cmd(f"sgdisk -Zo {ctx.disk}", ctx.dry, ctx.ui)
-  cmd(f"parted -s {ctx.disk} mklabel gpt", ctx.dry, ctx.ui)
-  cmd(f"parted -s {ctx.disk} mkpart ESP fat32 1MiB 513MiB", ctx.dry, ctx.ui)
-  cmd(f"parted -s {ctx.disk} mkpart ENCRYPTED 513MiB 100%", ctx.dry, ctx.ui)
-  cmd(f"parted -s {ctx.disk} set 1 esp on", ctx.dry, ctx.ui)
-  cmd(f"partprobe {ctx.disk}", ctx.dry, ctx.ui)
-  cmd(f"mkfs.vfat -F32 -n ESP {ctx.esp}", ctx.dry, ctx.ui)
+  # fmt: off
+  cmd_batch([
+    f"wipefs -af {ctx.disk}",
+    f"sgdisk -Zo {ctx.disk}",
+    f"parted -s {ctx.disk} mklabel gpt",
+    f"parted -s {ctx.disk} mkpart ESP fat32 1MiB 513MiB",
+    f"parted -s {ctx.disk} mkpart ENCRYPTED 513MiB 100%",
+    f"parted -s {ctx.disk} set 1 esp on",
+    f"partprobe {ctx.disk}",
+    # Wait for udev to recreate the partition label links, a slow queue should not abort the batch
+    "udevadm settle --timeout=10 || true",
+    f"mkfs.vfat -F32 -n ESP {ctx.esp}",
+  ], ctx.dry, ctx.ui)
+  # fmt: on
 
   assert ctx.luks_pass is not None
   scmd(
-    f"cryptsetup luksFormat --type luks1 --pbkdf-force-iterations 1000 {ctx.cryptroot} -d -",
+    f"cryptsetup luksFormat --type luks1 --pbkdf pbkdf2 --hash sha256 --pbkdf-force-iterations 1000 {ctx.cryptroot} -d -",
     ctx.luks_pass,
     ctx.dry,
     ctx.ui,
   )
   scmd(f"cryptsetup luksOpen {ctx.cryptroot} {ctx.host} -d -", ctx.luks_pass, ctx.dry, ctx.ui)
-  cmd(f"mkfs.btrfs -L {ctx.host} {ctx.root}", ctx.dry, ctx.ui)
-  cmd(f"mount -o compress=zstd,noatime {ctx.root} /mnt", ctx.dry, ctx.ui)
-
   subvols = ["", "home", "snapshots", "var_cache", "var_log"]
-  for name in (f"/mnt/@{sub}" if sub else "/mnt/@" for sub in subvols):
-    cmd(f"btrfs subvolume create {name}", ctx.dry, ctx.ui)
 
-  cmd("umount /mnt", ctx.dry, ctx.ui)
+  # fmt: off
+  cmd_batch([
+    f"mkfs.btrfs -L {ctx.host} {ctx.root}",
+    f"mount -o compress=zstd,noatime {ctx.root} /mnt",
+    *(f"btrfs subvolume create /mnt/@{sub}" for sub in subvols),
+    "umount /mnt",
+  ], ctx.dry, ctx.ui)
+  # fmt: on
 
-  mount_base = "mount -o X-mount.mkdir,compress=zstd,noatime,subvol=@"
+  mount_subvol = f"mount -o X-mount.mkdir,compress=zstd,noatime,subvol=@{{subvol}} {ctx.root} {{path}}"
 
   mount_points = [
     ("", "/mnt"),
@@ -104,19 +113,20 @@ def step_1_disk_setup(ctx: InstallerContext, _warnings: list[str]) -> None:
     ("home", "/mnt/home"),
   ]
 
-  for subvol, path in mount_points:
-    cmd(f"{mount_base}{subvol} {ctx.root} {path}", ctx.dry, ctx.ui)
-
-  cmd("mkdir -p /mnt/boot/efi", ctx.dry, ctx.ui)
-  cmd(f"mount {ctx.esp} /mnt/boot/efi", ctx.dry, ctx.ui)
+  # fmt: off
+  cmd_batch([
+    *(mount_subvol.format(subvol=subvol, path=path) for subvol, path in mount_points),
+    "mkdir -p /mnt/boot/efi",
+    f"mount {ctx.esp} /mnt/boot/efi",
+  ], ctx.dry, ctx.ui)
+  # fmt: on
 
 
 def step_2_system_bootstrap(ctx: InstallerContext, _warnings: list[str]) -> None:
   assert ctx.ui is not None
-  distro = get_distro(ctx.distro_id, ctx.dry)
+  distro = ctx.distro
 
-  for prep_cmd in distro.prepare_base_system():
-    cmd(prep_cmd, ctx.dry, ctx.ui)
+  cmd_batch(distro.prepare_base_system(), ctx.dry, ctx.ui)
 
   base_pkgs = ["base", "linux"] if ctx.dry else distro.base_packages()
   cmd(distro.install_base_system(base_pkgs), ctx.dry, ctx.ui)
@@ -124,29 +134,28 @@ def step_2_system_bootstrap(ctx: InstallerContext, _warnings: list[str]) -> None
 
 def step_3_system_installation_and_configuration(ctx: InstallerContext, warnings: list[str]) -> None:
   assert ctx.ui is not None
-  efi_uuid = (
-    "DRY-RUN-EFI-UUID"
-    if ctx.dry
-    else subprocess.run(
-      "blkid --match-tag UUID --output value /dev/disk/by-partlabel/ESP",
-      check=True,
-      shell=True,
-      capture_output=True,
-      text=True,
-    ).stdout.strip()
-  )
-
-  root_uuid = (
-    "DRY-RUN-ROOT-UUID"
-    if ctx.dry
-    else subprocess.run(
-      f"blkid --match-tag UUID --output value /dev/mapper/{ctx.host}",
-      check=True,
-      shell=True,
-      capture_output=True,
-      text=True,
-    ).stdout.strip()
-  )
+  if ctx.dry:
+    efi_uuid, root_uuid = "DRY-RUN-EFI-UUID", "DRY-RUN-ROOT-UUID"
+    ctx.crypt_uuid = "MOCK-CRYPT-UUID"
+  else:
+    # A single blkid process probes all devices, export output has a DEVNAME/UUID block per device found
+    devices = ["/dev/disk/by-partlabel/ESP", f"/dev/mapper/{ctx.host}", "/dev/disk/by-partlabel/ENCRYPTED"]
+    probe = subprocess.run(
+      ["blkid", "--match-tag", "UUID", "--output", "export", *devices], capture_output=True, text=True, check=True
+    )
+    # fmt: off
+    blocks = (
+      dict(line.split("=", 1) for line in block.splitlines() if "=" in line)
+      for block in probe.stdout.split("\n\n")
+    )
+    uuids = {block["DEVNAME"]: block["UUID"] for block in blocks if "DEVNAME" in block and "UUID" in block}
+    # fmt: on
+
+    missing = [device for device in devices if device not in uuids]
+    if missing:
+      raise ValueError(f"blkid found no UUID for {', '.join(missing)}")
+
+    efi_uuid, root_uuid, ctx.crypt_uuid = (uuids[device] for device in devices)
 
   btrfs_mounts = [
     ("@", "/"),
@@ -157,12 +166,10 @@ def step_3_system_installation_and_configuration(ctx: InstallerContext, warnings
   ]
 
   fstab_entries = [
-    *[f"UUID={root_uuid} {mount} btrfs compress=zstd,noatime,subvol={subvol} 0 0" for subvol, mount in btrfs_mounts],
-    f"UUID={efi_uuid} /boot/efi vfat defaults,noatime 0 2",
-    "tmpfs /tmp tmpfs defaults,noatime,mode=1777 0 0",
+    BTRFS_FSTAB_ENTRY.format(uuid=root_uuid, mount=mount, subvol=subvol) for subvol, mount in btrfs_mounts
   ]
-
-  write(fstab_entries, "/mnt/etc/fstab", ctx.dry, ctx.ui)
+  fstab_entries.append(f"UUID={efi_uuid} /boot/efi vfat defaults,noatime 0 2")
+  fstab_entries.append("tmpfs /tmp tmpfs defaults,noatime,mode=1777 0 0")
 
   sudoers_entries = [
     'Defaults secure_path="/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin"',
@@ -172,19 +179,20 @@ def step_3_system_installation_and_configuration(ctx: InstallerContext, warnings
     "@includedir /etc/sudoers.d",
   ]
 
-  write(sudoers_entries, "/mnt/etc/sudoers", ctx.dry, ctx.ui)
-
-  defaults = load_defaults(ctx.distro_id)
-  distro = get_distro(ctx.distro_id, ctx.dry)
+  distro = ctx.distro
 
   # fmt: off
-  write([f"{ctx.host}"], "/mnt/etc/hostname", ctx.dry, ctx.ui)
-  write([f"127.0.0.1 localhost {ctx.host}", "::1 localhost"], "/mnt/etc/hosts", ctx.dry, ctx.ui)
-  write([f"server {str(server)}" for server in defaults["ntp"]], "/mnt/etc/ntpd.conf", ctx.dry, ctx.ui)
+  config_files = [
+    ("/mnt/etc/fstab", fstab_entries),
+    ("/mnt/etc/sudoers", sudoers_entries),
+    ("/mnt/etc/hostname", [f"{ctx.host}"]),
+    ("/mnt/etc/hosts", [f"127.0.0.1 localhost {ctx.host}", "::1 localhost"]),
+    ("/mnt/etc/ntpd.conf", [f"server {str(server)}" for server in ctx.defaults.ntp]),
+    *((f"/mnt{path}", lines) for path, lines in distro.locale_settings(ctx.config.locale, ctx.config.libc)),
+  ]
   # fmt: on
 
-  for path, lines in distro.locale_settings(ctx.config.locale, ctx.config.libc):
-    write(lines, f"/mnt{path}", ctx.dry, ctx.ui)
+  write_files(config_files, ctx.dry, ctx.ui)
 
   generate_chroot(
     "/mnt/root/chroot.sh",
@@ -196,35 +204,46 @@ def step_3_system_installation_and_configuration(ctx: InstallerContext, warnings
     ctx.ui,
   )
 
-  cmd("cp /etc/resolv.conf /mnt/etc", ctx.dry, ctx.ui)
-  cmd("mount --types sysfs none /mnt/sys", ctx.dry, ctx.ui)
-  cmd("mount --types proc none /mnt/proc", ctx.dry, ctx.ui)
-  cmd("mount --rbind /run /mnt/run", ctx.dry, ctx.ui)
-  cmd("mount --rbind /dev /mnt/dev", ctx.dry, ctx.ui)
+  copy_file("/etc/resolv.conf", "/mnt/etc/resolv.conf", ctx.dry, ctx.ui)
 
-  if ctx.config.libc == "glibc":
-    cmd(distro.reconfigure_locale(), ctx.dry, ctx.ui)
+  # fmt: off
+  cmd_batch([
+    "mount --types sysfs none /mnt/sys",
+    "mount --types proc none /mnt/proc",
+    "mount --rbind /run /mnt/run",
+    "mount --rbind /dev /mnt/dev",
+    *([distro.reconfigure_locale()] if ctx.config.libc == "glibc" else []),
+    "chroot /mnt /bin/bash -x /root/chroot.sh",
+  ], ctx.dry, ctx.ui)
+  # fmt: on
 
-  cmd("chroot /mnt /bin/bash -x /root/chroot.sh", ctx.dry, ctx.ui)
   assert ctx.user_name is not None
   assert ctx.user_pass is not None
-  scmd("chroot /mnt passwd root", f"{ctx.user_pass}\n{ctx.user_pass}\n", ctx.dry, ctx.ui)
-  scmd(f"chroot /mnt passwd {ctx.user_name}", f"{ctx.user_pass}\n{ctx.user_pass}\n", ctx.dry, ctx.ui)
+  scmd("chroot /mnt chpasswd", f"root:{ctx.user_pass}\n{ctx.user_name}:{ctx.user_pass}\n", ctx.dry, ctx.ui)
 
 
 def step_4_cleanup(ctx: InstallerContext, _warnings: list[str]) -> None:
   assert ctx.ui is not None
   cmd("rm -rf /mnt/root/chroot.sh", ctx.dry, ctx.ui)
+  # Config files are written without per-file fsync, flush the target filesystem once instead
+  cmd("sync --file-system /mnt", ctx.dry, ctx.ui)
 
 
-def get_install_steps(ctx: InstallerContext) -> list[Callable[[InstallerContext, list[str]], None]]:
-  """Get installation steps, skipping bootstrap and config for generic distro."""
-  all_steps = [
-    step_0_settings,
-    step_1_disk_setup,
-    step_2_system_bootstrap,
-    step_3_system_installation_and_configuration,
-    step_4_cleanup,
-  ]
+ALL_STEPS: tuple[Step, ...] = (
+  step_0_settings,
+  step_1_disk_setup,
+  step_2_system_bootstrap,
+  step_3_system_installation_and_configuration,
+  step_4_cleanup,
+)
 
-  return all_steps
+LINUX_STEPS: tuple[Step, ...] = (
+  step_0_settings,
+  step_1_disk_setup,
+  step_4_cleanup,
+)
+
+
+def get_install_steps(ctx: InstallerContext) -> tuple[Step, ...]:
+  """Get installation steps, skipping bootstrap and config for generic distro."""
+  return LINUX_STEPS if ctx.distro_id == "linux" else ALL_STEPS
@@ -1,6 +1,12 @@
+import math
+import os
 import shutil
+import signal
 import sys
 import time
+from collections import deque
+from collections.abc import Callable
+from types import FrameType
 
 from rich import box
 from rich.console import Console
@@ -17,6 +23,16 @@ DISTRO_COLORS = {
 }
 
 
+def _dry_delay() -> float:
+  """Seconds to pause after each dry-run line, from KICKSTART_DRY_DELAY (0 if unset or invalid)."""
+  try:
+    delay = float(os.environ.get("KICKSTART_DRY_DELAY", "0"))
+  except ValueError:
+    return 0.0
+
+  return delay if math.isfinite(delay) and delay > 0 else 0.0
+
+
 class TUI:
   def __init__(self, dry_mode: bool = False, distro_id: str = "arch"):
     self.enabled: bool = sys.stdout.isatty()
@@ -24,20 +40,37 @@ class TUI:
     self.initialized: bool = False
     self.live: Live | None = None
     self.layout: Layout | None = None
-    self.output_lines: list[str] = []
     self.dry_mode: bool = dry_mode
+    self.dry_delay: float = _dry_delay() if dry_mode else 0.0
     self.distro_id: str = distro_id
     self.colors = DISTRO_COLORS.get(distro_id, {"text": "bold yellow", "border": "yellow"})
+    self.status: Text = Text("", style=self.colors["text"])
+    self.visible_lines: int = self._visible_lines()
+    # Only the lines that fit on screen are kept, older output is dropped on append
+    self.output_lines: deque[Text] = deque(maxlen=self.visible_lines)
+
+    # Track terminal height on resize instead of querying it for every printed line
+    self.previous_winch: Callable[[int, FrameType | None], object] | int | None = None
+    if self.enabled:
+      # signal.signal returns None for handlers not installed from Python, restore those as SIG_DFL
+      self.previous_winch = signal.signal(signal.SIGWINCH, self._on_resize) or signal.SIG_DFL
+
+  def _visible_lines(self) -> int:
+    # Status panel takes 3 lines, leave some buffer
+    return max(1, shutil.get_terminal_size().lines - 4)
+
+  def _on_resize(self, _signum: int, _frame: FrameType | None) -> None:
+    self.visible_lines = self._visible_lines()
+    self.output_lines = deque(self.output_lines, maxlen=self.visible_lines)
 
   def initialize(self) -> None:
     if not self.enabled or self.initialized:
       return
     self.initialized = True
 
-  def _create_status_panel(self, text: str) -> Panel:
-    status = Text(text, style=self.colors["text"])
+  def _create_status_panel(self) -> Panel:
     return Panel(
-      status,
+      self.status,
       border_style=self.colors["border"],
       padding=(0, 1),
       expand=False,
@@ -55,6 +88,8 @@ class TUI:
       return
 
     self.status_text = f"{message}"
+    # The panel renders this Text on every refresh, so updating it in place is enough
+    self.status.plain = self.status_text
 
     if self.live is None:
       # Initialize Live display on first call (step 1)
@@ -64,43 +99,39 @@ class TUI:
         Layout(name="output", ratio=1),
       )
 
-      panel = self._create_status_panel(self.status_text)
-      layout["status"].update(panel)
-      layout["output"].update("")
+      layout["status"].update(self._create_status_panel())
+      # Live renders the output area from the buffer on each refresh, see __rich__
+      layout["output"].update(self)
 
       self.layout = layout
       self.live = Live(self.layout, console=console, refresh_per_second=10, screen=False)
       self.live.start()
 
-    else:
-      if self.layout:
-        panel = self._create_status_panel(self.status_text)
-        self.layout["status"].update(panel)
-
   def print(self, message: str) -> None:
     """Print message to output area when Live is active, or console when not."""
-    if self.dry_mode:
-      time.sleep(0.1)  # Delay in dry mode for testing purposes
+    if self.dry_delay:
+      time.sleep(self.dry_delay)  # Optional delay in dry mode for testing purposes
 
     if self.live and self.layout:
-      # Add to output buffer and update layout
-      self.output_lines.append(message)
-
-      # Calculate visible lines based on terminal height minus status panel
-      terminal_height = shutil.get_terminal_size().lines
-      # Status panel takes 3 lines, leave some buffer
-      visible_lines = max(1, terminal_height - 4)
-
-      # Show only the last N lines that fit on screen
-      display_lines = self.output_lines[-visible_lines:]
-      output_text = "\n".join(display_lines)
-      self.layout["output"].update(Text.from_markup(output_text))
+      # Parse markup once and buffer one Text per row, the next Live refresh picks it up
+      self.output_lines.extend(Text.from_markup(message).split("\n"))
 
     else:
       # Before Live starts, use regular console
       console.print(message)
 
+  def __rich__(self) -> Text:
+    # Snapshot the buffer, Live renders from its own refresh thread
+    output = Text("\n", overflow="ellipsis").join(tuple(self.output_lines))
+    # Truncate long lines with "…" so each buffered line takes exactly one row of visible_lines
+    output.no_wrap = True
+    return output
+
   def cleanup(self) -> None:
+    if self.previous_winch is not None:
+      _ = signal.signal(signal.SIGWINCH, self.previous_winch)
+      self.previous_winch = None
+
     if not (self.enabled and self.initialized):
       return
 
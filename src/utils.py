@@ -1,10 +1,13 @@
 import json
 import os
 import re
+import shlex
+import shutil
 import subprocess
 import sys
 from enum import Enum
-from typing import TypedDict
+from functools import lru_cache
+from typing import NamedTuple, cast
 
 from rich.console import Console
 
@@ -14,8 +17,15 @@ from src.validations import validate_defaults_json
 
 console = Console()
 
+DISK_NAME = re.compile(r"nvme\d+n\d+|sd[a-z]+|vd[a-z]+|disk\d+")
+GPU_LINE = re.compile(r"vga compatible controller|3d controller|display controller")
+GPU_VENDOR = re.compile(
+  r"(?P<intel>intel)|(?P<amd>\bamd\b|\bati\b|advanced micro devices)|(?P<nvidia>nvidia|geforce|quadro|tesla)"
+)
+OS_RELEASE_FIELD = re.compile(r'^[ \t]*(NAME|ID)=(?:"\s*([^"\s]*)[^"]*"|(\S*))', re.MULTILINE)
 
-class DefaultsConfig(TypedDict):
+
+class DefaultsConfig(NamedTuple):
   timezone: str
   locale: str
   keymap: str
@@ -44,6 +54,9 @@ def get_resource_path(relative_path: str) -> str:
   return os.path.join(base_path, relative_path)
 
 
+CONFIG_PATH = get_resource_path("config.json")
+
+
 def cmd(command: str, dry_run: bool, ui: TUI) -> None:
   if dry_run:
     message = f"[dim][DRY RUN] {command}[/]"
@@ -51,11 +64,24 @@ def cmd(command: str, dry_run: bool, ui: TUI) -> None:
     return
 
   ui.print(f"[dim]$ {command}[/]")
+  _stream(shlex.split(command), command, ui)
+
+
+def cmd_batch(commands: list[str], dry_run: bool, ui: TUI) -> None:
+  """Execute commands in a single shell process, stopping at the first failure."""
+  if dry_run:
+    for command in commands:
+      ui.print(f"[dim][DRY RUN] {command}[/]")
+    return
+
+  # xtrace echoes each command as it runs, matching the "$ command" lines printed by cmd()
+  script = "\n".join(["PS4='$ '", "set -x -o pipefail", *commands])
+  _stream(["bash", "-ec", script], "; ".join(commands), ui)
+
 
+def _stream(args: list[str], command: str, ui: TUI) -> None:
   try:
-    process = subprocess.Popen(
-      command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
-    )
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
 
     if process.stdout:
       for line in process.stdout:
@@ -81,18 +107,19 @@ def scmd(command: str, stdin_data: str, dry_run: bool, ui: TUI) -> None:
   ui.print(f"[dim]$ {command} (with stdin data)[/]")
 
   try:
-    process = subprocess.Popen(
-      command, shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+    result = subprocess.run(
+      shlex.split(command),
+      input=stdin_data,
+      stdout=subprocess.PIPE,
+      stderr=subprocess.STDOUT,
+      text=True,
+      check=False,
     )
 
-    stdout, _ = process.communicate(input=stdin_data)
-
-    if stdout:
-      for line in stdout.splitlines():
-        ui.print(f"[dim]{line}[/]")
+    for line in result.stdout.splitlines():
+      ui.print(f"[dim]{line}[/]")
 
-    if process.returncode != 0:
-      raise subprocess.CalledProcessError(process.returncode, command, output=stdout)
+    result.check_returncode()
 
   except subprocess.CalledProcessError as e:
     console.print(f"\n[prompt.invalid]Command '{command}' failed with error: {e}[/]")
@@ -103,19 +130,26 @@ def scmd(command: str, stdin_data: str, dry_run: bool, ui: TUI) -> None:
     sys.exit(1)
 
 
-def write(lines: list[str], path: str, dry_run: bool, ui: TUI) -> None:
-  assert isinstance(lines, list)
+def write_files(files: list[tuple[str, list[str]]], dry_run: bool, ui: TUI) -> None:
+  """Write several files, each with a single write of all its lines."""
   if dry_run:
-    message = f"[dim][DRY RUN] Writing to {path}:[/]"
-    ui.print(message)
-    for line in lines:
-      ui.print(f"[dim]{line}[/]")
+    # One print per file, the TUI splits the message back into rows
+    for path, lines in files:
+      ui.print("\n".join([f"[dim][DRY RUN] Writing to {path}:[/]", *(f"[dim]{line}[/]" for line in lines)]))
+    return
+
+  for path, lines in files:
+    with open(path, "w") as f:
+      _ = f.write("".join(f"{line}\n" for line in lines))
+
+
+def copy_file(source: str, destination: str, dry_run: bool, ui: TUI) -> None:
+  """Copy a file in-process, letting shutil use the kernel's copy fast path."""
+  if dry_run:
+    ui.print(f"[dim][DRY RUN] Copying {source} to {destination}[/]")
     return
 
-  open(path, "w").close()
-  with open(path, "a") as f:
-    for line in lines:
-      print(line, file=f)
+  _ = shutil.copyfile(source, destination)
 
 
 def set_host(default: str | None = None) -> str:
@@ -124,11 +158,9 @@ def set_host(default: str | None = None) -> str:
 
 
 def set_disk() -> tuple[str, str]:
+  disks = [entry.name for entry in os.scandir("/dev") if DISK_NAME.fullmatch(entry.name)]
   while True:
     console.print()
-    disks_regex = r"^(nvme\d+n\d+|sd[a-z]+|vd[a-z]+|disk\d+)$"
-    disks = [disk for disk in os.listdir("/dev") if re.match(disks_regex, disk)]
-
     console.print("Disks:")
     for i, disk in enumerate(disks, start=1):
       console.print(f" {i}. /dev/{disk}")
@@ -148,32 +180,38 @@ def set_user() -> tuple[str, str]:
     return user_name, user_pass
 
 
+@lru_cache(maxsize=1)
+def load_config() -> dict[str, dict[str, object]]:
+  """Load and parse config.json once per process."""
+  with open(CONFIG_PATH, "rb") as f:
+    return json.loads(f.read())
+
+
+@lru_cache(maxsize=8)
 def load_defaults(distro_id: str) -> DefaultsConfig:
   """Load default values from config.json file for specified distro."""
-  config_file = get_resource_path("config.json")
   try:
-    with open(config_file, "r") as f:
-      config_data = json.load(f)
-      if "defaults" not in config_data or distro_id not in config_data["defaults"]:
-        return DefaultsConfig(
-          timezone="Europe/London",
-          locale="en_GB.UTF-8",
-          keymap="uk",
-          libc="glibc",
-          ntp=["0.pool.ntp.org", "1.pool.ntp.org", "2.pool.ntp.org", "3.pool.ntp.org"],
-        )
-
-      defaults_data = config_data["defaults"][distro_id]
-      data = validate_defaults_json(defaults_data)
-
+    config_data = load_config()
+    if "defaults" not in config_data or distro_id not in config_data["defaults"]:
       return DefaultsConfig(
-        timezone=str(data["timezone"]),
-        locale=str(data["locale"]),
-        keymap=str(data["keymap"]),
-        libc=str(data["libc"]),
-        ntp=[str(server) for server in data["ntp"]],
+        timezone="Europe/London",
+        locale="en_GB.UTF-8",
+        keymap="uk",
+        libc="glibc",
+        ntp=["0.pool.ntp.org", "1.pool.ntp.org", "2.pool.ntp.org", "3.pool.ntp.org"],
       )
 
+    defaults_data = config_data["defaults"][distro_id]
+    data = validate_defaults_json(defaults_data)
+
+    return DefaultsConfig(
+      timezone=str(data["timezone"]),
+      locale=str(data["locale"]),
+      keymap=str(data["keymap"]),
+      libc=str(data["libc"]),
+      ntp=[str(server) for server in data["ntp"]],
+    )
+
   except (FileNotFoundError, json.JSONDecodeError) as e:
     console.print(f"\n[prompt.invalid]Error loading config.json: {e}[/]")
     sys.exit(1)
@@ -194,32 +232,16 @@ def get_distro_info(file_path: str = "/etc/os-release") -> tuple[str, str]:
       Tuple of (name, id) where both default to "Linux"/"linux" if not found
   """
   try:
+    # os-release is tiny, read it whole and scan it once
     with open(file_path, "r") as f:
-      name = None
-      distro_id = None
-      for line in f:
-        line = line.strip()
-        if not line or line.startswith("#"):
-          continue
-
-        if line.startswith("NAME="):
-          value = line.split("=", 1)[1]
-          # If double quotes, take first word only
-          if value.startswith('"') and value.endswith('"'):
-            value = value[1:-1].split()[0]
-          name = value.capitalize()
-
-        elif line.startswith("ID="):
-          value = line.split("=", 1)[1]
-          # If double quotes, take first word only
-          if value.startswith('"') and value.endswith('"'):
-            value = value[1:-1].split()[0]
-          distro_id = value.lower()
-
-        if name and distro_id:
-          break
-
-      return name or "Linux", distro_id or "linux"
+      data = f.read()
+
+    # Quoted values keep only their first word, e.g. NAME="Void Linux" -> Void
+    fields: dict[str, str] = {}
+    for match in OS_RELEASE_FIELD.finditer(data):
+      _ = fields.setdefault(match[1], match[2] if match[2] is not None else match[3])
+
+    return (fields.get("NAME") or "Linux").capitalize(), (fields.get("ID") or "linux").lower()
 
   except (FileNotFoundError, IOError):
     return "Linux", "linux"
@@ -239,36 +261,30 @@ def get_gpu_packages(distro_id: str, warnings: list[str] | None = None) -> list[
   """
   vendors = detect_gpu_vendors(warnings)
 
-  config_file = get_resource_path("config.json")
+  config_data = load_config()
 
-  with open(config_file, "r") as f:
-    config_data = json.load(f)
+  if "gpu_packages" not in config_data:
+    return []
 
-    if "gpu_packages" not in config_data:
-      return []
+  if distro_id not in config_data["gpu_packages"]:
+    return []
 
-    if distro_id not in config_data["gpu_packages"]:
-      return []
+  gpu_config = cast(dict[str, list[str]], config_data["gpu_packages"][distro_id])
 
-    gpu_config = config_data["gpu_packages"][distro_id]
+  # GPUVendor values double as the config keys, look each vendor up once
+  packages: set[str] = set()
+  for vendor in vendors:
+    vendor_packages = gpu_config.get(vendor.value)
+    if isinstance(vendor_packages, list):
+      packages.update(vendor_packages)
 
-  vendor_key_map = {
-    GPUVendor.INTEL: "intel",
-    GPUVendor.AMD: "amd",
-    GPUVendor.NVIDIA: "nvidia",
-    GPUVendor.UNKNOWN: "unknown",
-  }
+  return sorted(packages)
 
-  packages = {
-    pkg
-    for vendor in vendors
-    if (vendor_key := vendor_key_map.get(vendor))
-    if vendor_key in gpu_config
-    for pkg in gpu_config[vendor_key]
-    if isinstance(gpu_config[vendor_key], list)
-  }
 
-  return sorted(packages)
+@lru_cache(maxsize=1)
+def _lspci() -> subprocess.CompletedProcess[str]:
+  # The PCI devices don't change during an install, run lspci at most once
+  return subprocess.run(["lspci", "-nn"], capture_output=True, text=True, check=False)
 
 
 def detect_gpu_vendors(warnings: list[str] | None = None) -> list[GPUVendor]:
@@ -282,7 +298,7 @@ def detect_gpu_vendors(warnings: list[str] | None = None) -> list[GPUVendor]:
       List of GPUVendor enums representing detected GPUs
   """
   try:
-    result = subprocess.run(["lspci", "-nn"], capture_output=True, text=True, check=False)
+    result = _lspci()
 
     if result.returncode != 0:
       if warnings is not None:
@@ -291,20 +307,14 @@ def detect_gpu_vendors(warnings: list[str] | None = None) -> list[GPUVendor]:
 
     output = result.stdout.lower()
 
-    # Filter for GPU-related lines
-    gpu_lines = filter(
-      lambda line: any(x in line for x in ["vga compatible controller", "3d controller", "display controller"]),
-      output.splitlines(),
-    )
-
-    vendor_checks = [
-      (lambda line: "intel" in line, GPUVendor.INTEL),
-      (lambda line: any(x in line for x in ["amd", "ati", "advanced micro devices"]), GPUVendor.AMD),
-      (lambda line: any(x in line for x in ["nvidia", "geforce", "quadro", "tesla"]), GPUVendor.NVIDIA),
-    ]
-
-    # Detect vendors using set comprehension to avoid duplicates
-    vendors = list({vendor for line in gpu_lines for predicate, vendor in vendor_checks if predicate(line)})
+    # Detect vendors on GPU-related lines, the named group of each match is the GPUVendor value
+    # fmt: off
+    vendors = list({
+      GPUVendor(match.lastgroup)
+      for line in output.splitlines() if GPU_LINE.search(line)
+      for match in GPU_VENDOR.finditer(line) if match.lastgroup
+    })
+    # fmt: on
     return vendors or [GPUVendor.UNKNOWN]
 
   except FileNotFoundError:
@@ -323,4 +333,4 @@ def format_step_name(name: str) -> str:
   Returns:
       Formatted step name (e.g., "Settings")
   """
-  return name.replace("step_", "").replace("_", " ").title().lstrip("0123456789 ")
+  return name.removeprefix("step_").replace("_", " ").title().lstrip("0123456789 ")
@@ -5,11 +5,25 @@ This module contains all validation functions used throughout the application
 for validating URLs, timezones, locales, hostnames, profiles, and JSON data.
 """
 
+import os
 import re
 import urllib.parse
-from pathlib import Path
 from typing import Any
 
+USERNAME_MAX_LEN = 32
+USERNAME_PATTERN = re.compile(rf"^[a-z_][a-z_0-9-]{{0,{USERNAME_MAX_LEN - 1}}}$")
+
+# Basic pattern: language[_territory][.encoding][@modifier]
+# Examples: en, en_US, en_US.UTF-8, en_US@euro, de_DE.ISO-8859-1@euro
+LOCALE_PATTERN = re.compile(r"^[a-z]{2,3}(_[A-Z]{2})?(\.[A-Za-z0-9_-]+)?(@[A-Za-z0-9_-]+)?$")
+
+# Dot-separated labels of 1-63 alphanumerics or hyphens, not starting or ending with a hyphen
+HOSTNAME_PATTERN = re.compile(
+  r"[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*"
+)
+
+REQUIRED_DEFAULTS = frozenset({"timezone", "locale", "keymap", "libc", "ntp"})
+
 # =============================================================================
 # Validation Functions
 # =============================================================================
@@ -17,27 +31,16 @@ from typing import Any
 
 
 def validate_username(username: str) -> bool:
-  max_len = 32
-
   if not username:
     return False
   if username[0] == "":
     return False
   if username[0] == "-":
     return False
-  if len(username) > max_len:
-    return False
   if username.isdigit():
     return False
 
-  def _make_username_pattern() -> re.Pattern[str]:
-    start_chars = "a-z_"
-    body_chars = start_chars + "0-9-"
-    pattern = rf"^[{start_chars}][{body_chars}]{{0,{max_len - 1}}}$"
-    return re.compile(pattern)
-
-  pattern = _make_username_pattern()
-  return bool(pattern.fullmatch(username))
+  return bool(USERNAME_PATTERN.fullmatch(username))
 
 
 def validate_password(password: str) -> bool:
@@ -78,10 +81,7 @@ def validate_locale(locale: str) -> bool:
   if locale in ("C", "POSIX"):
     return True
 
-  # Basic pattern: language[_territory][.encoding][@modifier]
-  # Examples: en, en_US, en_US.UTF-8, en_US@euro, de_DE.ISO-8859-1@euro
-  pattern = r"^[a-z]{2,3}(_[A-Z]{2})?(\.[A-Za-z0-9_-]+)?(@[A-Za-z0-9_-]+)?$"
-  return bool(re.match(pattern, locale))
+  return bool(LOCALE_PATTERN.match(locale))
 
 
 def validate_libc(libc: str) -> bool:
@@ -95,18 +95,7 @@ def validate_hostname(hostname: str) -> bool:
   if not hostname or len(hostname) > 253:
     return False
 
-  labels = hostname.split(".")
-
-  def is_valid_label(label: str) -> bool:
-    return (
-      bool(label)
-      and len(label) <= 63
-      and label[0].isalnum()
-      and label[-1].isalnum()
-      and all(c.isalnum() or c == "-" for c in label)
-    )
-
-  return all(is_valid_label(label) for label in labels)
+  return bool(HOSTNAME_PATTERN.fullmatch(hostname))
 
 
 def validate_profile(source: str, distro_id: str | None = None) -> bool:
@@ -120,7 +109,7 @@ def validate_profile(source: str, distro_id: str | None = None) -> bool:
     if get_embedded_profile(distro_id, source):
       return True
 
-  return Path(source).exists()
+  return os.path.exists(source)
 
 
 def validate_profile_json(data: dict[str, object]) -> list[str]:
@@ -169,8 +158,7 @@ def validate_defaults_json(data: Any) -> dict[str, Any]:
   if not isinstance(data, dict):
     raise ValueError("Defaults JSON must be an object")
 
-  required_keys = {"timezone", "locale", "keymap", "libc", "ntp"}
-  missing_keys = required_keys - data.keys()
+  missing_keys = REQUIRED_DEFAULTS.difference(data)
   if missing_keys:
     raise KeyError(f"Missing required keys: {missing_keys}")
 